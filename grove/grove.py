@@ -1,6 +1,15 @@
+import bisect
+import csv
+import functools
 import logging
+import os
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Union
+from typing import Union
 
 import numpy as np
 import pandas as pd
@@ -19,6 +28,17 @@ LOG_FORMAT = "%(name)s %(levelname)s:\t%(message)s"
 logging.basicConfig(format=LOG_FORMAT, level=logging.INFO)
 logger = logging.getLogger('grove')
 
+_MISSING = object()
+
+# Candidate integer types for reduce_mem_series, smallest first, with their value ranges
+_UINT_BOUNDS = [(dtype, np.iinfo(dtype).min, np.iinfo(dtype).max)
+                for dtype in [np.uint8, np.uint16, np.uint32]]
+_INT_BOUNDS = [(dtype, np.iinfo(dtype).min, np.iinfo(dtype).max)
+               for dtype in [np.int8, np.int16, np.int32]]
+
+# Copy-on-Write makes the merge / concat copy keyword obsolete (and deprecated) from pandas 3
+_NO_COPY = {'copy': False} if int(pd.__version__.split('.')[0]) < 3 else {}
+
 
 class Collection:
     """
@@ -43,50 +63,94 @@ class Collection:
     Note:
         For attribute access, the Collection class attribute names
         (e.g. ``show_schema``) take precedence and will be returned instead.
+
+    Note:
+        Assigning an attribute adds a DataFrame (or a file given as ``pathlib.Path``).
+        Other attributes can't be set on a Collection, except in subclasses.
     """
 
-    def __init__(self, data_sources: Union[dict, Iterable] = None):
+    __slots__ = ('_data_frames', '_sorted_names', '_string_backend',
+                 '_max_resident', '_resident', '_lazy')
+
+    def __init__(self,
+                 data_sources: Union[dict, Iterable] = None,
+                 string_backend: str = None,
+                 max_resident: int = None,
+                 lazy: bool = True):
         """
         One can create an empty collection and add DataFrames iteratively,
         or initialize from a list / dictionary specifying DataFrames and names.
 
         :param data_sources: Pairs of names and file paths / DataFrames,
-                             as a list of tuples or dictionary
+                             as a list of tuples or dictionary.
+                             Files can be delimited text (e.g. ``.csv``, ``.tsv``),
+                             Parquet (``.parquet``), or Feather (``.feather``).
+        :param string_backend: If given (``'pyarrow'`` or ``'python'``),
+                               text columns of DataFrames read from files are converted
+                               to the Pandas ``string`` dtype with this storage.
+                               The ``'pyarrow'`` storage (requires pyarrow) keeps strings
+                               in contiguous buffers, which uses much less memory
+                               than ``object`` columns.
+        :param max_resident: If given, at most this many DataFrames read from files
+                             are kept in memory. The least recently used ones are dropped
+                             and read again from file when next accessed,
+                             so any in-place changes to them are lost.
+                             In-place Collection operations (e.g. :py:meth:`reduce_mem`)
+                             are therefore not allowed.
+                             DataFrames added as objects are always kept.
+        :param lazy: If True (default), files are only read on first access to their DataFrame.
+                     Otherwise, files are read when added to the Collection,
+                     with the initial ``data_sources`` being read concurrently.
 
         Example
         -------
         >>> data = grove.Collection()
-        >>> data['A'] = 'a.csv'  # Will load data in a pandas DataFrame
+        >>> data['A'] = 'a.csv'  # Will load data in a pandas DataFrame on first access
         >>> data['B'] = df
         >>>
         >>> data = grove.Collection({'A':  'a.csv',
         ...                          'B': pathlib.Path('b.tsv'),
         ...                          'C': df})
         """
+        if max_resident is not None and (
+                not isinstance(max_resident, int) or isinstance(max_resident, bool) or max_resident < 1):
+            raise GroveError(f'max_resident must be a positive integer, got {max_resident!r}')
+        if string_backend not in (None, 'pyarrow', 'python'):
+            raise GroveError(f"string_backend must be 'pyarrow' or 'python', got {string_backend!r}")
+        self._data_frames = {}
+        self._sorted_names = []
+        self._string_backend = string_backend
+        self._max_resident = max_resident
+        self._resident = OrderedDict()
+        self._lazy = lazy
         if data_sources is None:
-            self._data_frames = {}
             return
         if isinstance(data_sources, dict):
-            data_sources = list(data_sources.items())
-        self._data_frames = {}
-        if isinstance(data_sources, Iterable):
-            for df_name, df_source in data_sources:
-                self._add_dataframes(df_name, df_source)
-        else:
+            data_sources = data_sources.items()
+        try:
+            data_sources = iter(data_sources)
+        except TypeError:
             raise GroveError('data_sources specification not supported')
+        for df_name, df_source in data_sources:
+            self._add_dataframes(df_name, df_source)
+        if not lazy:
+            for _ in self._iter_dataframes():
+                pass
 
     def __getitem__(self, df_names: Union[str, list]) -> Union[pd.DataFrame, list]:
         """Retrieve DataFrame using indexing."""
         if isinstance(df_names, str):
-            df_names = [df_names]
+            if df_names not in self._data_frames:
+                raise GroveError(f'DataFrame(s) not in Collection: {[df_names]}')
+            return self._get_dataframe(df_names)
 
-        missing_names = [
-            name for name in df_names if name not in self._data_frames
-        ]
+        missing_names = set(df_names).difference(self._data_frames.keys())
         if missing_names:
+            missing_names = [name for name in df_names if name in missing_names]
             raise GroveError(f'DataFrame(s) not in Collection: {missing_names}')
 
-        df_list = [self._data_frames[name] for name in df_names]
+        self._load_dataframes(df_names)
+        df_list = [self._get_dataframe(name) for name in df_names]
         if len(df_list) == 1:
             return df_list[0]
         else:
@@ -94,43 +158,128 @@ class Collection:
 
     def __setitem__(self, df_name: str, df_source: Union[pd.DataFrame, str, Path]):
         self._add_dataframes(df_name, df_source)
+        if not self._lazy:
+            self._get_dataframe(df_name)
 
     def __getattr__(self, df_name: str) -> pd.DataFrame:
         """
         Retrieve DataFrame as attribute, unless an existing Collection attribute
         exists called `df_name`, in which case that is returned.
         """
+        # Looked up directly, to avoid recursion before _data_frames is set (e.g. unpickling)
         try:
-            return self._data_frames[df_name]
-        except KeyError as _:
+            data_frames = object.__getattribute__(self, '_data_frames')
+        except AttributeError:
+            data_frames = {}
+        df = data_frames.get(df_name, _MISSING)
+        if df is _MISSING:
             raise AttributeError(f"'Collection' object has no attribute '{df_name}'")
+        if isinstance(df, _LazyFrame):
+            return self._get_dataframe(df_name)
+        return df
+
+    def __setattr__(self, name: str, value):
+        """
+        Add DataFrame (or file path, as ``pathlib.Path``) with attribute syntax.
+        Other values, and names defined by the class, are set as usual attributes.
+        """
+        if (name not in Collection.__slots__ and not hasattr(type(self), name)
+                and isinstance(value, (pd.DataFrame, Path))):
+            self[name] = value
+        else:
+            object.__setattr__(self, name, value)
 
     def __repr__(self):
-        if len(self._data_frames.items()) == 0:
+        if len(self._data_frames) == 0:
             return 'Collection is empty'
-        descr = ''
-        for df_name, df in self._data_frames.items():
-            descr += df_name + '\n' + '=' * max(8, len(df_name)) + '\n'
-            descr += f'* cols: {len(df.columns)}' + '\n'
-            descr += f'* rows: {df.shape[0]}' + '\n'
-            descr += '\n'
-        return descr
+        descr = []
+        for df_name, df in self._iter_dataframes():
+            n_rows, n_cols = df.shape
+            descr.append(f'{_decoration_title(df_name)}\n* cols: {n_cols}\n* rows: {n_rows}\n\n')
+        return ''.join(descr)
 
     def _add_dataframes(self, df_name, df_source: Union[pd.DataFrame, str, Path]):
         """
-        Generic method to add a DataFrame to a grove Collection
+        Generic method to add a DataFrame to a grove Collection.
+        Files are not read here, but on first access to the DataFrame
+        (or right after being added, for non-lazy Collections).
 
         :param df_name: String name for the new Collection DataFrame
         :param df_source: A file path (as str or pathlib.Path) or DataFrame object
         """
+        if not isinstance(df_name, str):
+            # Names are kept sorted, which needs them to be comparable
+            raise GroveError(f'DataFrame names must be strings, got {df_name!r}')
+        # Attribute names are interned, so attribute access finds the key by identity
+        df_name = sys.intern(df_name)
+        self._resident.pop(df_name, None)
         if isinstance(df_source, str) or isinstance(df_source, Path):
-            self._data_frames[df_name] = _read_dataframe(df_source)
-        elif isinstance(df_source, pd.DataFrame):
-            self._data_frames[df_name] = df_source
-        else:
+            df_source = _LazyFrame(df_source, self._string_backend)
+        elif not isinstance(df_source, pd.DataFrame):
             raise TypeError(f'{df_source} is an unsupported data type')
+        if df_name not in self._data_frames:
+            bisect.insort(self._sorted_names, df_name)
+        self._data_frames[df_name] = df_source
+
+    def _get_dataframe(self, df_name: str) -> pd.DataFrame:
+        """Retrieve a DataFrame by name, reading it from file if not yet loaded."""
+        df = self._data_frames[df_name]
+        if isinstance(df, _LazyFrame):
+            df = df()
+            if self._max_resident is not None:
+                self._mark_resident(df_name)
+        return df
+
+    def _check_in_place(self, operation: str):
+        """
+        Refuse in-place operations on all DataFrames when these can be unloaded,
+        since the changes would be lost.
+        """
+        if self._max_resident is not None:
+            raise GroveError(f'{operation} modifies DataFrames in-place, '
+                             f'so it cannot be used with max_resident')
+
+    def _mark_resident(self, df_name: str):
+        """
+        Record `df_name` as the most recently used file DataFrame,
+        and unload the least recently used ones beyond ``max_resident``.
+        """
+        self._resident[df_name] = None
+        self._resident.move_to_end(df_name)
+        while len(self._resident) > self._max_resident:
+            evicted_name, _ = self._resident.popitem(last=False)
+            self._data_frames[evicted_name].unload()
+
+    def _load_dataframes(self, df_names: Iterable):
+        """
+        Read all not yet loaded DataFrames among `df_names`.
+        Files are read concurrently, since the C parser releases the GIL.
+        """
+        pending = {}
+        for df_name in df_names:
+            df = self._data_frames[df_name]
+            if isinstance(df, _LazyFrame) and not df.is_loaded:
+                pending[df_name] = df
+        if len(pending) < 2:
+            return
+        if self._max_resident is not None and len(pending) > self._max_resident:
+            # Read on access, so unused DataFrames can be unloaded in between
+            return
+        max_workers = min(len(pending), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_LazyFrame.__call__, pending.values()))
 
-    def merge(self, df_name_list: list, on: Union[str, list] = None) -> pd.DataFrame:
+    def _iter_dataframes(self):
+        """Iterate over (name, DataFrame) pairs, loading DataFrames as needed."""
+        self._load_dataframes(self._data_frames.keys())
+        for df_name in self._data_frames.keys():
+            yield df_name, self._get_dataframe(df_name)
+
+    def merge(self,
+              df_name_list: list,
+              on: Union[str, list] = None,
+              columns: dict = None,
+              reorder: bool = False) -> pd.DataFrame:
         """
         Merge multiple DataFrames in the Collection (as an inner join).
 
@@ -188,23 +337,59 @@ class Collection:
         ...     on=[[['A', 'B']], ['id2', 'id_x']]
         ... )
 
+        Only the needed columns can be selected from each DataFrame
+        (join columns are always kept), so unused columns aren't carried through the merges:
+
+        >>> data.merge(['items', 'categories', 'measurements'], on='id',
+        ...            columns={'items': ['description'], 'measurements': ['value']})
+
         :param df_name_list: Names of collection DataFrame to merge
         :param on: Column names to join on.
                    Either a single string or omitted if it's the same across all
                    DataFrames. If column names to join on differ, these are given
                    as a list.
+        :param columns: Columns to keep from DataFrames, as a dictionary of
+                        DataFrame names to lists of column names.
+                        DataFrames not in the dictionary keep all their columns.
+                        Requires ``on`` to be given. Missing columns raise a GroveError.
+        :param reorder: See :py:func:`grove.merge`
         :return: Merged DataFrame
         """
-        return merge(
-            [self._data_frames[df_name] for df_name in df_name_list], on=on
-        )
-
-    def info(self, memory_usage=True, verbose=False):
+        self._load_dataframes(df_name_list)
+        df_list = [self._get_dataframe(df_name) for df_name in df_name_list]
+        id_list_norm = _normalize_on(on, len(df_list))
+        _check_merge_keys(df_list, id_list_norm)
+        if columns:
+            if on is None:
+                raise GroveError('Selecting merge columns requires the join columns (on) to be given')
+            missing = []
+            for df_num, (df_name, df) in enumerate(zip(df_name_list, df_list)):
+                for col in columns.get(df_name, []):
+                    if col not in df.columns and (col, df_num) not in missing:
+                        missing.append((col, df_num))
+            if missing:
+                raise GroveError('; '.join(f"'{col}' not present in DataFrame {df_num}"
+                                           for col, df_num in missing))
+            df_list = [
+                _select_merge_columns(df, columns[df_name], id_list_norm, df_num)
+                if df_name in columns else df
+                for df_num, (df_name, df) in enumerate(zip(df_name_list, df_list))
+            ]
+        return merge(df_list, on=on, reorder=reorder)
+
+    def info(self, memory_usage=True, verbose=False, deep=False, file=None):
         """
         Print information about the collection.
 
         :param memory_usage: Whether to include memory estimates from DataFrames
         :param verbose: Whether to also call ``.info()`` for DataFrames
+        :param deep: Whether to measure the memory of the objects in ``object`` columns
+                     (e.g. Python strings), as in ``DataFrame.memory_usage(deep=True)``.
+                     This is exact but scans every value, so is slow for large DataFrames.
+                     Otherwise, only the array sizes are counted.
+        :param file: Text stream to write the information to, instead of standard output.
+                     With ``verbose``, the DataFrame details are then written as plain text
+                     instead of being displayed.
 
         Example
         -------
@@ -217,39 +402,39 @@ class Collection:
         ['categories', 'items', 'measurements']
         Memory usage
         ============
-            DataFrame       MiB
-                items  0.000818
-           categories  0.001476
-         measurements  0.001195
-                TOTAL  0.003489
+           DataFrame      MiB
+               items 0.000261
+          categories 0.000359
+        measurements 0.000498
+               TOTAL 0.001118
         """
-        n_df = len(self._data_frames.items())
-        df_names = sorted([df_name for df_name in self._data_frames.keys()])
+        n_df = len(self._data_frames)
+        df_names = self._sorted_names
         info = ''
         info += f'Contents: {n_df} DataFrames\n' + str(df_names) + '\n'
 
         if memory_usage:
             info += '\nMemory usage\n============\n'
-            mem_list = pd.DataFrame.from_records(
-                [(df_name, df.memory_usage(deep=True).sum() / 1024 ** 2)
-                  for df_name, df in self._data_frames.items()],
-                columns=['DataFrame', 'MiB']
-            )
-            mem_list = pd.concat(
-                [
-                    mem_list,
-                    pd.DataFrame([{'DataFrame': 'TOTAL', 'MiB': mem_list['MiB'].sum()}])
-                ],
-                ignore_index=True
-            )
+            mib = np.fromiter(
+                (df.memory_usage(deep=deep).values.sum() for _, df in self._iter_dataframes()),
+                dtype=np.float64, count=n_df
+            ) / 1024 ** 2
+            mem_list = pd.DataFrame({
+                'DataFrame': list(self._data_frames.keys()) + ['TOTAL'],
+                'MiB': np.append(mib, mib.sum())
+            })
             info += mem_list.to_string(index=False) + '\n'
 
-        print(info)
+        print(info, file=file)
         if verbose:
             for df_name in df_names:
-                display(TextHeader(df_name))
-                display(self._data_frames[df_name].dtypes.rename('Dtype').rename_axis('Column').reset_index())
-                print()
+                dtypes = self._get_dataframe(df_name).dtypes.rename('Dtype').rename_axis('Column').reset_index()
+                if file is None:
+                    display(TextHeader(df_name))
+                    display(dtypes)
+                    print()
+                else:
+                    print(TextHeader(df_name), dtypes.to_string(), '', sep='\n', file=file)
 
     def reduce_mem(self, target_float: str = 'float32'):
         """
@@ -324,10 +509,63 @@ class Collection:
 
         :param target_float: Float columns will be converted to this precision.
         """
-        for df_name in self._data_frames.keys():
-            _ = reduce_mem_df(self._data_frames[df_name],
-                              target_float=target_float,
-                              inplace=True)
+        self._check_in_place('reduce_mem')
+        for _, df in self._iter_dataframes():
+            _ = reduce_mem_df(df, target_float=target_float, inplace=True)
+
+    def set_join_key(self, column: str):
+        """
+        Sort all Collection DataFrames having the given column by it, so that Pandas
+        merges on this column with a linear join of the sorted keys,
+        instead of hashing the keys at every merge.
+        This is done **in-place** (i.e. will change the row order of the collection DataFrames).
+        The sort is stable and the row index labels are kept.
+
+        Example
+        -------
+
+        >>> data.set_join_key('id')
+        >>> data.merge(['items', 'categories', 'measurements'], on='id')
+
+        :param column: Name of the column which will be joined on
+        """
+        self._check_in_place('set_join_key')
+        for _, df in self._iter_dataframes():
+            if column in df.columns and not df[column].is_monotonic_increasing:
+                df.sort_values(column, kind='stable', inplace=True)
+
+    def share_categories(self, columns: Union[str, list]):
+        """
+        Convert the given columns to a categorical dtype,
+        with the same categories in all Collection DataFrames having these columns.
+        This is done **in-place** (i.e. will modify the collection DataFrames).
+
+        Merges on shared categorical columns are done on the integer category codes,
+        instead of hashing the (string) values at each merge.
+        Repeated strings are also stored only once, as categories.
+
+        Example
+        -------
+
+        >>> data = grove.Collection({'items': 'items.csv',
+        ...                          'categories': 'categories.csv'})
+        >>> data.share_categories('id')
+        >>> data.merge(['items', 'categories'], on='id')
+
+        :param columns: Column name or list of column names to convert
+        """
+        self._check_in_place('share_categories')
+        frames = [df for _, df in self._iter_dataframes()]
+        for col in _as_list(columns):
+            col_frames = [df for df in frames if col in df.columns]
+            if not col_frames:
+                continue
+            categories = pd.concat(
+                [df[col] for df in col_frames], ignore_index=True
+            ).dropna().unique()
+            shared_dtype = pd.CategoricalDtype(categories)
+            for df in col_frames:
+                df[col] = df[col].astype(shared_dtype)
 
     def head(self,  n: int = 5) -> None:
         """
@@ -335,7 +573,7 @@ class Collection:
 
         :param n: How many rows to show
         """
-        for df_name, df in self._data_frames.items():
+        for df_name, df in self._iter_dataframes():
             display(TextHeader(df_name), df.head(n))
             print()
 
@@ -345,7 +583,7 @@ class Collection:
         Collection DataFrames.
         See documentation for :py:func:`grove.sanity_check_df` for more details
         """
-        for df_name, df in self._data_frames.items():
+        for df_name, df in self._iter_dataframes():
             display(TextHeader(df_name))
             sanity_check_df(df)
             print()
@@ -355,10 +593,10 @@ class Collection:
         """
         Get the sorted list of DataFrame names in the Collection.
         """
-        return sorted(self._data_frames.keys())
+        return list(self._sorted_names)
 
 
-def merge(df_list: list, on: Union[str, int, list] = None) -> pd.DataFrame:
+def merge(df_list: list, on: Union[str, int, list] = None, reorder: bool = False) -> pd.DataFrame:
     """
     Merge multiple DataFrames (as an inner join).
     This module-level function allows more flexibility in passing DataFrames
@@ -435,14 +673,196 @@ def merge(df_list: list, on: Union[str, int, list] = None) -> pd.DataFrame:
                Either a single string or omitted if it's the same across all
                DataFrames. If column names to join on differ, these are given
                as a list.
+    :param reorder: If True, and all DataFrames are merged on a single common column,
+                    the pairwise merges may be done in a different order than given,
+                    to keep the intermediate results small
+                    (e.g. small, filtering DataFrames are merged first).
+                    The result has the same columns, but the row order may differ.
     :return: Merged DataFrame
     """
+    # Nothing to merge, but the result is still a new DataFrame, as with pd.merge
+    if len(df_list) == 1:
+        return df_list[0].copy(deep=False)
+
+    id_list_norm = _normalize_on(on, len(df_list))
+
+    _check_merge_keys(df_list, id_list_norm)
+
+    # An inner join with an empty DataFrame is empty, so only the result columns
+    # need to be determined, which is done by merging empty DataFrames.
+    if any(df.shape[0] == 0 for df in df_list):
+        df_list = [df.iloc[:0] for df in df_list]
+
+    key = _common_key(id_list_norm)
+
+    # Identical sorted unique keys everywhere: rows are already aligned
+    if key is not None and _is_aligned_key(df_list, key):
+        return _concat_aligned(df_list, id_list_norm, key)
+
+    # Many-to-one merge of two DataFrames: look up the left keys in the right key index
+    if key is not None and len(df_list) == 2:
+        merged_df = _merge_unique_right(df_list, id_list_norm, key)
+        if merged_df is not None:
+            return merged_df
+
+    # Small-first join order, merging only the join keys with row positions
+    merged_df = None
+    if reorder and key is not None and len(df_list) > 2:
+        merged_df = _merge_reordered(df_list, id_list_norm, key)
+    if merged_df is None:
+        merged_df = _merge_pairwise(df_list, id_list_norm)
+
+    return merged_df
+
+
+def _merge_pairwise(df_list: list, id_list_norm: list) -> pd.DataFrame:
+    """Merge DataFrames with successive ``pd.merge`` calls, left to right."""
+    merged_df = df_list[0]
+    for i, m_id in enumerate(id_list_norm):
+        right_df = df_list[i + 1]
+        if merged_df.shape[0] == 0:
+            right_df = right_df.iloc[:0]
+        try:
+            merged_df = pd.merge(
+                merged_df,
+                right_df,
+                left_on=m_id[0],
+                right_on=m_id[1],
+                suffixes=('_' + str(i), '_' + str(i+1)),
+                **_NO_COPY
+            )
+        except Exception as e:
+            print(f"Error merging in the following DataFrame \n{df_list[i]}\n\n"
+                  f"to the intermediately merged DataFrame \n{merged_df}\n\n"
+                  "Raising caught exception.")
+            raise e
+
+    return merged_df
+
+
+def _merge_reordered(df_list: list, id_list_norm: list, key) -> Union[pd.DataFrame, None]:
+    """
+    Merge DataFrames on a common ``key`` column in an order chosen to keep
+    the intermediate results small, instead of the order of ``df_list``.
+    Only the key and row positions of each DataFrame are merged, and all columns
+    are gathered once at the end, so the result has the same columns as merging in the given order.
+
+    The order is chosen greedily, starting from the smallest DataFrame,
+    by adding the DataFrame with the smallest estimated output size:
+    ``min(n_rows, n_rows_other) * n_rows_other / n_unique_keys_other``.
+
+    Return None if the result layout can't be mapped back to the input columns.
+    """
+    layout = _merge_layout(df_list, id_list_norm)
+    if layout is None:
+        return None
+    empty_df, sources, _ = layout
+
+    n_rows = [df.shape[0] for df in df_list]
+    key_factors = [n / max(df[key].nunique(dropna=False), 1) for n, df in zip(n_rows, df_list)]
+    remaining = list(range(len(df_list)))
+    order = [min(remaining, key=lambda df_num: n_rows[df_num])]
+    remaining.remove(order[0])
+    est_rows = n_rows[order[0]]
+    while remaining:
+        costs = {df_num: min(est_rows, n_rows[df_num]) * key_factors[df_num] for df_num in remaining}
+        next_num = min(remaining, key=costs.get)
+        order.append(next_num)
+        remaining.remove(next_num)
+        est_rows = costs[next_num]
+
+    positions = None
+    for df_num in order:
+        df_positions = pd.DataFrame({
+            '_key': df_list[df_num][key].array,
+            '_' + str(df_num): np.arange(n_rows[df_num])
+        })
+        if positions is None:
+            positions = df_positions
+        else:
+            positions = pd.merge(positions, df_positions, on='_key', **_NO_COPY)
+
+    return _gather_positions(df_list, positions, empty_df, sources)
+
+
+def _merge_layout(df_list: list, id_list_norm: list) -> Union[tuple, None]:
+    """
+    Determine the layout (column names, suffixes, dtypes) of the pairwise merge result
+    by merging empty DataFrames, and track the source of each result column.
+
+    :return: The empty merge result, the (DataFrame number, column) source of each of its columns,
+             and for each pairwise merge, a dict mapping the intermediate result columns
+             to their sources. None if the sources can't be determined.
+    """
+    if any(m_id[0] is None for m_id in id_list_norm):
+        return None
+    if not all(df.columns.is_unique for df in df_list):
+        return None
+
+    # Track the source (DataFrame number, column) of each column in the intermediate results
+    empty_df = df_list[0].iloc[:0]
+    sources = [(0, col) for col in df_list[0].columns]
+    step_sources = []
+    for i, m_id in enumerate(id_list_norm):
+        if not empty_df.columns.is_unique:
+            return None
+        step_sources.append(dict(zip(empty_df.columns, sources)))
+        try:
+            empty_df = pd.merge(
+                empty_df,
+                df_list[i + 1].iloc[:0],
+                left_on=m_id[0],
+                right_on=m_id[1],
+                suffixes=('_' + str(i), '_' + str(i+1))
+            )
+        except Exception:
+            return None
+        left_on, right_on = [_as_list(cols) for cols in m_id]
+        common_keys = {right for left, right in zip(left_on, right_on) if left == right}
+        sources = sources + [(i + 1, col) for col in df_list[i + 1].columns
+                             if col not in common_keys]
+        if len(sources) != empty_df.shape[1]:
+            return None
+    if any(dtype != df_list[df_num][col].dtype
+           for dtype, (df_num, col) in zip(empty_df.dtypes, sources)):
+        return None
+    return empty_df, sources, step_sources
+
+
+def _gather_positions(df_list: list, positions: pd.DataFrame,
+                      empty_df: pd.DataFrame, sources: list) -> pd.DataFrame:
+    """
+    Build the merge result from the matched row positions of each DataFrame
+    (columns ``'_<DataFrame number>'`` of ``positions``),
+    with the layout and column sources given by :py:func:`_merge_layout`.
+    """
+    # Sources are grouped by DataFrame, in order, so whole DataFrames can be gathered at once
+    parts = []
+    for df_num, df in enumerate(df_list):
+        columns = [col for source_num, col in sources if source_num == df_num]
+        part = df[columns].take(positions['_' + str(df_num)].to_numpy())
+        parts.append(part.reset_index(drop=True))
+    merged_df = pd.concat(parts, axis=1)
+    merged_df.columns = empty_df.columns
+    return merged_df
+
+
+def _as_list(cols) -> list:
+    """Wrap a single column name in a list."""
+    return cols if isinstance(cols, list) else [cols]
+
+
+def _normalize_on(on: Union[str, int, list, None], n_dfs: int) -> list:
+    """
+    Normalize a ``merge`` ``on`` specification for ``n_dfs`` DataFrames
+    into a list of ``[left_on, right_on]`` pairs, one for each pairwise merge.
+    """
     # Normalize id_list for uniform merging
     # Normal form is [[ids, ids], [ids, ids], ... ]
     if on is None:
-        id_list = [[None, None] for _ in range(len(df_list) - 1)]
+        id_list = [[None, None] for _ in range(n_dfs - 1)]
     elif isinstance(on, str) or isinstance(on, int):
-        id_list = [[on, on] for _ in range(len(df_list) - 1)]
+        id_list = [[on, on] for _ in range(n_dfs - 1)]
     elif isinstance(on, list):
         id_list = on
     else:
@@ -451,12 +871,21 @@ def merge(df_list: list, on: Union[str, int, list] = None) -> pd.DataFrame:
     # Process list into (left_on, right_on pairs)
     id_list_norm = []
     for m_id in id_list:
+        # Nesting depth of the spec, probed on the first element (see _depth)
+        depth = 0
+        if isinstance(m_id, list) and m_id:
+            inner = m_id[0]
+            if not isinstance(inner, list):
+                depth = 1
+            elif not (inner and isinstance(inner[0], list)):
+                depth = 2
+
         # Common column name
         if isinstance(m_id, str):
             merge_pair = [m_id, m_id]
 
         # Multi-column merge
-        elif isinstance(m_id, list) and _depth(m_id) == 2:
+        elif depth == 2:
 
             # same columns: [['A', 'B']]
             if len(m_id) == 1:
@@ -469,7 +898,7 @@ def merge(df_list: list, on: Union[str, int, list] = None) -> pd.DataFrame:
                 raise GroveError(f'Specification of merge columns not supported: {on}')
 
         #  Diff left and right columns: ['A', 'B']
-        elif isinstance(m_id, list) and _depth(m_id) == 1 and len(m_id) == 2:
+        elif depth == 1 and len(m_id) == 2:
             merge_pair = m_id
 
         else:
@@ -477,38 +906,134 @@ def merge(df_list: list, on: Union[str, int, list] = None) -> pd.DataFrame:
 
         id_list_norm.append(merge_pair)
 
-    # id_list = [[m_id, m_id] if isinstance(m_id, str) else m_id
-    #            for m_id in id_list]
+    return id_list_norm
+
 
-    # Explicitly fail if columns not present
+def _check_merge_keys(df_list: list, id_list_norm: list) -> None:
+    """
+    Explicitly fail if join columns are not present,
+    reporting all missing columns at once, before any merging is done.
+    """
+    frame_columns = {}
+    missing = []
     for i, m_id in enumerate(id_list_norm):
         for k, col_id in enumerate(m_id):
             if col_id is not None:
                 df_num = i + k
-                try:
-                    _ = df_list[df_num][col_id]
-                except KeyError:
-                    raise GroveError(f"'{col_id}' not present in DataFrame {df_num}")
+                if df_num not in frame_columns:
+                    frame_columns[df_num] = set(df_list[df_num].columns)
+                col_ids = col_id if isinstance(col_id, list) else [col_id]
+                for col in col_ids:
+                    if col not in frame_columns[df_num] and (col, df_num) not in missing:
+                        missing.append((col, df_num))
+    if missing:
+        raise GroveError('; '.join(f"'{col}' not present in DataFrame {df_num}"
+                                   for col, df_num in missing))
+
+
+def _common_key(id_list_norm: list):
+    """
+    Return the join column if all merges are on the same single, common column,
+    otherwise None.
+    """
+    if not id_list_norm:
+        return None
+    key = id_list_norm[0][0]
+    if key is None or isinstance(key, list):
+        return None
+    if all(m_id[0] == key and m_id[1] == key for m_id in id_list_norm):
+        return key
+    return None
 
-    merged_df = df_list[0]
-    for i, m_id in enumerate(id_list_norm):
-        try:
-            merged_df = pd.merge(
-                merged_df,
-                df_list[i + 1],
-                left_on=m_id[0],
-                right_on=m_id[1],
-                suffixes=('_' + str(i), '_' + str(i+1))
-            )
-        except Exception as e:
-            print(f"Error merging in the following DataFrame \n{df_list[i]}\n\n"
-                  f"to the intermediately merged DataFrame \n{merged_df}\n\n"
-                  "Raising caught exception.")
-            raise e
 
+def _is_aligned_key(df_list: list, key) -> bool:
+    """
+    Check that the ``key`` column is sorted, unique, and identical in all DataFrames
+    (values and dtype, regardless of the row index),
+    i.e. that the merge would just put the rows side by side.
+    """
+    # Cheap checks first, since this is probed for every merge on a common key
+    n_rows = df_list[0].shape[0]
+    if not all(df.shape[0] == n_rows and df.columns.is_unique for df in df_list):
+        return False
+    first_key = df_list[0][key]
+    if not all(df[key].dtype == first_key.dtype for df in df_list[1:]):
+        return False
+    # The Index engine gets uniqueness cheaply from the monotonicity scan
+    first_key_index = pd.Index(first_key)
+    return (first_key_index.is_monotonic_increasing
+            and first_key_index.is_unique
+            and all(df[key].array.equals(first_key.array) for df in df_list[1:]))
+
+
+def _concat_aligned(df_list: list, id_list_norm: list, key) -> pd.DataFrame:
+    """
+    Merge DataFrames with aligned keys (see :py:func:`_is_aligned_key`)
+    by concatenating them column-wise, without any joining.
+    The result layout is taken from merging empty DataFrames.
+    """
+    empty_df = _merge_pairwise([df.iloc[:0] for df in df_list], id_list_norm)
+    merged_df = pd.concat(
+        [df_list[0].reset_index(drop=True)]
+        + [df.drop(columns=key).reset_index(drop=True) for df in df_list[1:]],
+        axis=1,
+        **_NO_COPY
+    )
+    merged_df.columns = empty_df.columns
     return merged_df
 
 
+def _merge_unique_right(df_list: list, id_list_norm: list, key) -> Union[pd.DataFrame, None]:
+    """
+    Merge two DataFrames on a common ``key`` column which is unique in the right DataFrame.
+    Each left key then matches at most one right row, whose position is found
+    with an Index lookup, so the right rows are gathered with a single ``take``.
+    The result layout is taken from merging empty DataFrames.
+
+    :return: Merged DataFrame, or None if the fast path doesn't apply
+    """
+    left_df, right_df = df_list
+    if not (left_df.columns.is_unique and right_df.columns.is_unique):
+        return None
+    if left_df[key].dtype != right_df[key].dtype:
+        return None
+    right_key_index = pd.Index(right_df[key])
+    if not right_key_index.is_unique:
+        return None
+
+    right_positions = right_key_index.get_indexer(left_df[key])
+    matched = right_positions >= 0
+    if not matched.all():
+        left_df = left_df[matched]
+        right_positions = right_positions[matched]
+
+    empty_df = _merge_pairwise([df.iloc[:0] for df in df_list], id_list_norm)
+    merged_df = pd.concat(
+        [left_df.reset_index(drop=True),
+         right_df.drop(columns=key).take(right_positions).reset_index(drop=True)],
+        axis=1,
+        **_NO_COPY
+    )
+    merged_df.columns = empty_df.columns
+    return merged_df
+
+
+def _select_merge_columns(df: pd.DataFrame, columns: list, id_list_norm: list, df_num: int) -> pd.DataFrame:
+    """
+    Select the given ``columns`` from DataFrame number ``df_num`` in a merge,
+    together with any columns it's joined on. The column order is preserved.
+    """
+    keep = set(columns)
+    key_specs = []
+    if df_num > 0:
+        key_specs.append(id_list_norm[df_num - 1][1])
+    if df_num < len(id_list_norm):
+        key_specs.append(id_list_norm[df_num][0])
+    for cols in key_specs:
+        keep.update(cols if isinstance(cols, list) else [cols])
+    return df.loc[:, [col for col in df.columns if col in keep]]
+
+
 def reduce_mem_series(values: pd.Series, target_float: str = 'float32') -> pd.Series:
     """
     Minimize memory usage of a Series
@@ -539,18 +1064,25 @@ def reduce_mem_series(values: pd.Series, target_float: str = 'float32') -> pd.Se
         return values
     if values.dtype.kind == 'f':
         return values.astype(target_float)
+    if values.shape[0] == 0:
+        return values.copy()
 
-    min_val = values.min()
-    max_val = values.max()
+    # Plain NumPy reductions skip the pandas N/A handling (integer arrays have no N/As)
+    int_values = values.to_numpy() if isinstance(values.dtype, np.dtype) else values
+    min_val = int_values.min()
+    max_val = int_values.max()
     new_type = values.dtype
-    for dtype in [np.uint8, np.uint16, np.uint32, np.int8, np.int16, np.int32]:
-        if np.iinfo(dtype).min <= min_val and max_val <= np.iinfo(dtype).max:
+    for dtype, dtype_min, dtype_max in (_UINT_BOUNDS if min_val >= 0 else _INT_BOUNDS):
+        if dtype_min <= min_val and max_val <= dtype_max:
             new_type = dtype
             break
     opt = values.astype(new_type)
 
-    assert np.allclose(values.values, opt.values), \
-        'Grove bug: Type-optimized values differ from input'
+    # The bounds check makes the cast exact, so the full comparison is only a
+    # sanity check, done for small Series (and skipped entirely with python -O)
+    if __debug__ and values.shape[0] < 10_000:
+        assert np.allclose(values.values, opt.values), \
+            'Grove bug: Type-optimized values differ from input'
     return opt
 
 
@@ -599,15 +1131,21 @@ def reduce_mem_df(df: pd.DataFrame,
              otherwise a reference will be returned to the changed input DataFrame.
     """
     if inplace:
-        opt = df
-    else:
-        opt = df.copy(deep=True)
-    for label, _ in opt.items():
-        opt[label] = reduce_mem_series(opt[label], target_float=target_float)
+        for label, _ in df.items():
+            df[label] = reduce_mem_series(df[label], target_float=target_float)
+        return df
+
+    # Build from the reduced columns, instead of first deep-copying the wide dtypes
+    opt = pd.DataFrame(
+        {col_num: reduce_mem_series(df.iloc[:, col_num], target_float=target_float)
+         for col_num in range(df.shape[1])},
+        index=df.index
+    )
+    opt.columns = df.columns
     return opt
 
 
-def sanity_check_df(df: pd.DataFrame, id_column: str = '') -> bool:
+def sanity_check_df(df: pd.DataFrame, id_column: str = '', fail_fast: bool = False) -> bool:
     """
     Check for typical desirable data properties for the given DataFrame:
 
@@ -637,12 +1175,27 @@ def sanity_check_df(df: pd.DataFrame, id_column: str = '') -> bool:
 
     :param df: Pandas DataFrame
     :param id_column: If given, this column is checked for unique values
+    :param fail_fast: If True, stop at the first failed check, instead of reporting all problems.
+                      The (costly) ID uniqueness checks are then done last,
+                      and skipped if other checks fail.
     :return: **True** if all checks passed, **False** otherwise
     """
+    if fail_fast:
+        # The uniqueness checks are the costly ones, so they are done last
+        columns = _scan_columns(df, check_unique=False)
+        if not (_check_null_cols(columns) and _check_obj_cols(columns)):
+            return False
+        _scan_unique(df, columns, id_column)
+        if not _check_id_col(columns, id_column):
+            return False
+        logger.info('All checks passed')
+        return True
+
+    columns = _scan_columns(df, id_column)
     if all([
-        _check_id_col(df, id_column),
-        _check_null_cols(df),
-        _check_obj_cols(df)
+        _check_id_col(columns, id_column),
+        _check_null_cols(columns),
+        _check_obj_cols(columns)
         ]
     ):
         logger.info('All checks passed')
@@ -650,27 +1203,65 @@ def sanity_check_df(df: pd.DataFrame, id_column: str = '') -> bool:
     return False
 
 
-def _check_id_col(df: pd.DataFrame, id_column: str = ''):
+@dataclass
+class _ColumnStats:
+    """Per-column properties gathered by :func:`_scan_columns`."""
+    position: int
+    has_na: bool
+    all_na: bool
+    is_obj: bool
+    is_unique: bool = None
+
+
+def _scan_columns(df: pd.DataFrame, id_column: str = '', check_unique: bool = True) -> dict:
+    """
+    Gather the properties used by the sanity checks for all columns at once.
+    N/As are found from the per-column non-N/A counts, and object columns from the dtypes,
+    without building N/A masks or Series for each column.
+    Uniqueness (if `check_unique`) is computed as in :func:`_scan_unique`.
+    """
+    n_rows = df.shape[0]
+    columns = {}
+    for col_num, (label, n_valid, dtype) in enumerate(zip(df.columns, df.count(), df.dtypes)):
+        columns[label] = _ColumnStats(
+            position=col_num,
+            has_na=n_valid < n_rows,
+            all_na=n_valid == 0,
+            is_obj=dtype == np.dtype('O')
+        )
+    if check_unique:
+        _scan_unique(df, columns, id_column)
+    return columns
+
+
+def _scan_unique(df: pd.DataFrame, columns: dict, id_column: str = '') -> None:
+    """
+    Add uniqueness to the scanned `columns`, only where it is needed:
+    for `id_column`, if given, otherwise for the non-float columns without N/As.
+    """
+    for label, stats in columns.items():
+        col = df.iloc[:, stats.position]
+        if label == id_column or (not id_column and not stats.has_na and col.dtype.kind != 'f'):
+            stats.is_unique = _series_has_unique_values(col)
+
+
+def _check_id_col(columns: dict, id_column: str = ''):
     """
     Return True (passed) if the provided `id_column` has unique values
-    or if any column has unique values and can be used as ID, if `id_column` not given.
+    or if any scanned column has unique values and can be used as ID, if `id_column` not given.
     """
     passed = True
     if id_column:
-        if not _series_has_unique_values(df[id_column]):
+        if not columns[id_column].is_unique:
             logger.warning(f"ID column '{id_column}' does not have unique values")
             passed = False
-        elif df[id_column].isna().any():
+        elif columns[id_column].has_na:
             logger.warning(f"ID column '{id_column}' has N/A values")
             passed = False
     else:
-        potential_id_columns = []
-        for label, _ in df.items():
-            if (df[label].dtype.kind != 'f'
-                and _series_has_unique_values(df[label])
-                and not df[label].isna().any()
-            ):
-                potential_id_columns.append(label)
+        potential_id_columns = [
+            label for label, stats in columns.items() if stats.is_unique
+        ]
         if not potential_id_columns:
             logger.warning('No columns in the DataFrame can be used as IDs (unique, non-float, no N/As)')
             passed = False
@@ -681,12 +1272,9 @@ def _check_id_col(df: pd.DataFrame, id_column: str = ''):
     return passed
 
 
-def _check_null_cols(df: pd.DataFrame):
-    """Return True (passed) if no columns in `df` are completely null."""
-    null_columns = []
-    for label, _ in df.items():
-        if df[label].isna().all():
-            null_columns.append(label)
+def _check_null_cols(columns: dict):
+    """Return True (passed) if none of the scanned `columns` are completely null."""
+    null_columns = [label for label, stats in columns.items() if stats.all_na]
     if null_columns:
         logger.warning(
             'The following columns are completely empty (N/A): ' + str(null_columns)
@@ -695,12 +1283,9 @@ def _check_null_cols(df: pd.DataFrame):
     return True
 
 
-def _check_obj_cols(df: pd.DataFrame):
-    """Return True (passed) if no columns in `df` have `object` dtype."""
-    obj_columns = []
-    for label, _ in df.items():
-        if df[label].dtype == np.dtype('O'):
-            obj_columns.append(label)
+def _check_obj_cols(columns: dict):
+    """Return True (passed) if none of the scanned `columns` have `object` dtype."""
+    obj_columns = [label for label, stats in columns.items() if stats.is_obj]
     if obj_columns:
         logger.warning(
             "The following columns have dtype 'object' and will likely cause merge errors: " + str(obj_columns)
@@ -710,15 +1295,140 @@ def _check_obj_cols(df: pd.DataFrame):
 
 
 def _series_has_unique_values(series: pd.Series) -> bool:
-    if series.values.shape[0] > series.unique().shape[0]:
-        return False
-    else:
-        return True
+    # duplicated() only produces a boolean mask, unlike unique(),
+    # which materializes every distinct value
+    return not series.duplicated().any()
+
 
+@dataclass
+class _LazyFrame:
+    """
+    Deferred DataFrame for a file source.
+    The file is only read on the first call, and the result is kept afterwards.
+    Missing local files are reported on creation, as when reading eagerly.
+    The path is kept as given, so URLs are passed on to Pandas unchanged.
+    """
+    path: Union[str, Path]
+    string_backend: str = None
+    _df: pd.DataFrame = field(default=None, repr=False)
 
-def _read_dataframe(df_source):
-    """Light wrapper to uniformize parameters, any processing, etc."""
-    return pd.read_table(df_source, sep=None, engine='python')
+    def __post_init__(self):
+        if not _is_url(self.path) and not os.path.isfile(os.path.expanduser(self.path)):
+            raise FileNotFoundError(f'No such file: {self.path}')
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._df is not None
+
+    def unload(self):
+        """Drop the loaded DataFrame, to be read again on the next call."""
+        self._df = None
+
+    def __call__(self) -> pd.DataFrame:
+        if self._df is None:
+            self._df = _read_dataframe(self.path, string_backend=self.string_backend)
+        return self._df
+
+
+def _read_dataframe(df_source, string_backend: str = None):
+    """
+    Light wrapper to uniformize parameters, any processing, etc.
+
+    The reader is chosen by file extension (see ``_READERS``).
+    Files with other extensions are treated as delimited text,
+    with the separator sniffed from the start of the file.
+    If ``string_backend`` is given, text columns are converted to the ``string`` dtype
+    with that storage.
+    """
+    suffix = os.path.splitext(str(df_source))[1]
+    reader = _READERS.get(suffix.lower(), _read_sniffed)
+    df = reader(df_source)
+    if string_backend is not None:
+        _convert_string_columns(df, string_backend)
+    return df
+
+
+def _convert_string_columns(df: pd.DataFrame, string_backend: str) -> None:
+    """
+    Convert (in-place) all text columns to the ``string`` dtype with the given storage.
+    ``object`` columns are only converted if all their values are strings.
+    """
+    string_dtype = pd.StringDtype(string_backend)
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.StringDtype):
+            convert = dtype.storage != string_backend
+        elif dtype == np.dtype('O'):
+            convert = pd.api.types.infer_dtype(df[col], skipna=True) == 'string'
+        else:
+            convert = False
+        if convert:
+            df[col] = df[col].astype(string_dtype)
+
+
+def _read_delimited(df_source: Union[str, Path], sep: str) -> pd.DataFrame:
+    """
+    Read a delimited text file with the C parser.
+    The whole file is type-inferred at once, instead of chunk-wise with possibly mixed-type columns,
+    and local files are memory-mapped, so they're parsed directly from the page cache.
+    """
+    return pd.read_csv(df_source, sep=sep, engine='c', low_memory=False,
+                       memory_map=not _is_url(df_source))
+
+
+def _read_sniffed(df_source: Union[str, Path]) -> pd.DataFrame:
+    """
+    Read a delimited text file of unknown format.
+    The slow Python parser is only used if the separator can't be determined.
+    """
+    sep = _sniff_separator(df_source)
+    if sep is None:
+        return pd.read_table(df_source, sep=None, engine='python')
+    return _read_delimited(df_source, sep)
+
+
+def _sniff_separator(df_source: Union[str, Path], sample_size: int = 8192,
+                     delimiters: str = ',\t;| ') -> Union[str, None]:
+    """
+    Guess the separator from the first bytes of the file.
+    Return None on failure, or for URLs, which aren't fetched just to sniff them.
+    """
+    if _is_url(df_source):
+        return None
+    with open(os.path.expanduser(df_source), 'rb') as source_file:
+        sample = source_file.read(sample_size).decode('utf-8', errors='replace')
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=delimiters).delimiter
+    except csv.Error:
+        return None
+
+
+def _is_url(df_source: Union[str, Path]) -> bool:
+    """Whether the source is a URL (e.g. ``https://`` or ``s3://``) rather than a local path."""
+    return isinstance(df_source, str) and '://' in df_source
+
+
+def _read_suffix_delimited(df_source: Union[str, Path], sep: str) -> pd.DataFrame:
+    """
+    Read a delimited text file with the separator expected from its suffix.
+    If that yields a single column, the file may use another separator
+    (e.g. ``;`` in a ``.csv``), which is then sniffed.
+    """
+    df = _read_delimited(df_source, sep)
+    if df.shape[1] == 1:
+        # No spaces, which can be part of single column values
+        sniffed_sep = _sniff_separator(df_source, delimiters=',\t;|')
+        if sniffed_sep is not None and sniffed_sep != sep:
+            df = _read_delimited(df_source, sniffed_sep)
+    return df
+
+
+_READERS = {
+    '.csv': functools.partial(_read_suffix_delimited, sep=','),
+    '.tsv': functools.partial(_read_suffix_delimited, sep='\t'),
+    '.parquet': pd.read_parquet,
+    '.feather': pd.read_feather,
+}
 
 
 def _decoration_title(df_name: str) -> str:
@@ -729,17 +1439,18 @@ def _depth(on_list: Union[list, str]) -> int:
     """
     Count the depth of a list expected to be a ``on`` merge spec.
     Expects symmetric list contents, i.e. [A, B] and [[A, B], [X, Y]].
-    The depth probing is done recursively on the first element.
+    The depth probing is done iteratively on the first element.
     """
-    if isinstance(on_list, str):
-        return 0
-    elif isinstance(on_list, list):
-        return _depth(on_list[0]) + 1
-    else:
-        return 0
+    depth = 0
+    while isinstance(on_list, list):
+        on_list = on_list[0]
+        depth += 1
+    return depth
 
 
 class TextHeader:
+    __slots__ = ('text',)
+
     def __init__(self, text: str = ''):
         self.text = text
 
@@ -1,5 +1,4 @@
 # Tests for bugs
-from contextlib import redirect_stdout
 import io
 
 import grove
@@ -14,8 +13,8 @@ def test_issue_1_info_pandas_2():
         'measurements': 'test/data/measurements.csv'
     })
 
-    with redirect_stdout(io.StringIO()) as grove_print:
-        data.info(verbose=True)
+    grove_print = io.StringIO()
+    data.info(verbose=True, file=grove_print)
     grove_print = grove_print.getvalue()
 
     assert len(grove_print) > 0
@@ -45,7 +44,7 @@ def test_issue_2_numeric_col_names():
     result = data.merge(['A', 'B'], on=0)
     expected_result = pd.merge(df1, df2, suffixes=('_0', '_1'), on=0)
     assert result.shape[0] > 0
-    assert result.compare(expected_result).empty
+    pd.testing.assert_frame_equal(result, expected_result, check_dtype=False)
 
 
 def test_issue_3_duplicate_col_names_due_to_suffixes():
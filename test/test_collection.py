@@ -1,11 +1,42 @@
 """
 Test general Collection management
 """
-from contextlib import redirect_stdout
+import copy
 import io
+import pickle
 
 import grove
 import pandas as pd
+import pytest
+
+
+_CSV_BEFORE = 'id,value\na,1\nb,2\n'
+_CSV_AFTER = 'id,value\nc,3\n'
+
+
+def write_csv_files(tmp_path, names) -> dict:
+    """Write a small CSV file per name, to detect when they are read by overwriting them."""
+    paths = {name: tmp_path / f'{name}.csv' for name in names}
+    for path in paths.values():
+        path.write_text(_CSV_BEFORE)
+    return paths
+
+
+def overwrite_csv_files(paths: dict):
+    for path in paths.values():
+        path.write_text(_CSV_AFTER)
+
+
+def read_before_overwrite(df) -> bool:
+    return df['id'].to_list() == ['a', 'b']
+
+
+def info_mib(data, **info_kwargs) -> dict:
+    """Memory usage by DataFrame name, as reported by Collection.info."""
+    output = io.StringIO()
+    data.info(file=output, **info_kwargs)
+    table = output.getvalue().split('============\n')[1].strip().splitlines()[1:]
+    return {name: float(mib) for name, mib in (line.split() for line in table)}
 
 
 def test_create_collection_from_spec():
@@ -38,6 +69,29 @@ def test_create_collection_from_data():
     })
     assert len(data.dataframe_list) == 2
 
+    data.C = df1
+    assert data.dataframe_list == ['A', 'B', 'C']
+    assert data['C'] is df1
+
+    with pytest.raises(grove.GroveError):
+        data[0] = df1
+
+    # Only DataFrames and file paths are added as attributes
+    with pytest.raises(AttributeError):
+        data.note = 'hello'
+    assert data.dataframe_list == ['A', 'B', 'C']
+
+
+def test_collection_subclass_attributes():
+    class LabeledCollection(grove.Collection):
+        def __init__(self, data_sources, label):
+            super().__init__(data_sources)
+            self.label = label
+
+    data = LabeledCollection({'A': pd.DataFrame({'id': [1, 2]})}, 'x')
+    assert data.label == 'x'
+    assert data.dataframe_list == ['A']
+
 
 def test_collection_inspection():
     data = grove.Collection(
@@ -48,6 +102,10 @@ def test_collection_inspection():
     )
     assert data.dataframe_list == ['categories', 'items', 'measurements']
 
+    data['categories'] = 'test/data/categories.csv'
+    data['descriptions'] = 'test/data/category_descriptions.csv'
+    assert data.dataframe_list == ['categories', 'descriptions', 'items', 'measurements']
+
 
 def test_collection_info():
     """
@@ -60,7 +118,246 @@ def test_collection_info():
     # Edge case: empty Collection
 
     data = grove.Collection()
-    with redirect_stdout(io.StringIO()) as grove_print:
-        data.info(verbose=True)
+    grove_print = io.StringIO()
+    data.info(verbose=True, file=grove_print)
     grove_print = grove_print.getvalue()
     assert grove_print.startswith('Contents: 0 DataFrames')
+
+
+def test_lazy_loading(tmp_path):
+    paths = write_csv_files(tmp_path, ['items', 'categories'])
+    data = grove.Collection(paths)
+    # Files are only read on first access
+    overwrite_csv_files(paths)
+    assert not read_before_overwrite(data.items)
+
+    # Loaded DataFrames are kept, not re-read
+    paths['items'].write_text(_CSV_BEFORE)
+    assert not read_before_overwrite(data.items)
+    assert data['items'] is data.items
+
+
+def test_read_separator_sniffing(tmp_path):
+    df = pd.DataFrame({'id': ['A1', 'A2', 'B1'], 'value': [1, 2, 3]})
+    df.to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+    df.to_csv(tmp_path / 'data.txt', sep=';', index=False)
+    df.to_csv(tmp_path / 'semicolon.csv', sep=';', index=False)
+    df[['id']].to_csv(tmp_path / 'single.csv', index=False)
+
+    data = grove.Collection({
+        'from_suffix': tmp_path / 'data.tsv',
+        'sniffed': tmp_path / 'data.txt',
+        'semicolon': tmp_path / 'semicolon.csv',
+        'single': tmp_path / 'single.csv'
+    })
+    assert data.from_suffix.shape == (3, 2)
+    assert data.sniffed.columns.to_list() == ['id', 'value']
+    assert data.sniffed.shape == (3, 2)
+    assert data.semicolon.columns.to_list() == ['id', 'value']
+    assert data.single.columns.to_list() == ['id']
+
+
+def test_read_dates_as_text(tmp_path):
+    (tmp_path / 'dates.csv').write_text('id,date\na,2021-03-01\nb,2021-03-02\n')
+
+    data = grove.Collection({'dates': tmp_path / 'dates.csv'})
+    assert data.dates['date'].to_list() == ['2021-03-01', '2021-03-02']
+
+
+def test_concurrent_loading(tmp_path):
+    paths = write_csv_files(tmp_path, ['items', 'categories', 'measurements'])
+    data = grove.Collection(paths)
+    items, categories = data[['items', 'categories']]
+    overwrite_csv_files(paths)
+    assert read_before_overwrite(items)
+    assert read_before_overwrite(categories)
+    assert data.items is items
+    assert not read_before_overwrite(data.measurements)
+
+
+def test_eager_loading(tmp_path):
+    paths = write_csv_files(tmp_path, ['items', 'categories', 'measurements'])
+    data = grove.Collection(
+        [('items', paths['items']),
+         ('categories', paths['categories'])
+         ],
+        lazy=False
+    )
+    data['measurements'] = paths['measurements']
+    overwrite_csv_files(paths)
+    assert read_before_overwrite(data.items)
+    assert read_before_overwrite(data.categories)
+    assert read_before_overwrite(data.measurements)
+
+
+def test_collection_info_memory_updates():
+    data = grove.Collection(
+        [('items', 'test/data/items.csv'),
+         ('measurements', 'test/data/measurements.csv')
+         ]
+    )
+    mib_before = info_mib(data)
+    assert set(mib_before.keys()) == {'items', 'measurements', 'TOTAL'}
+    assert info_mib(data) == mib_before
+
+    # Changed dtypes are reflected in the reported usage
+    data.reduce_mem()
+    mib_reduced = info_mib(data)
+    assert mib_reduced['measurements'] < mib_before['measurements']
+
+    # As are replaced DataFrames
+    data['items'] = data['measurements']
+    assert info_mib(data)['items'] == mib_reduced['measurements']
+
+    # And in-place changes to the DataFrames
+    df = pd.DataFrame({'s': pd.Series(['a', 'b'], dtype=object)})
+    data['strings'] = df
+    mib_before = info_mib(data, deep=True)['strings']
+    df.loc[0, 's'] = 'x' * 10 ** 6
+    assert info_mib(data, deep=True)['strings'] > mib_before + 0.9
+    mib_before = info_mib(data)['strings']
+    df.index = pd.Index(['row_a', 'row_b'])
+    assert info_mib(data)['strings'] != mib_before
+
+
+def test_missing_dataframes():
+    data = grove.Collection([('items', 'test/data/items.csv')])
+    with pytest.raises(grove.GroveError, match=r"not in Collection: \['X'\]"):
+        _ = data['X']
+    with pytest.raises(grove.GroveError, match=r"not in Collection: \['X', 'Y'\]"):
+        _ = data[['X', 'items', 'Y']]
+
+
+def test_missing_file():
+    with pytest.raises(FileNotFoundError):
+        grove.Collection([('items', 'test/data/no_items.csv')])
+
+
+def test_file_source_paths(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    (tmp_path / 'items.csv').write_text(_CSV_BEFORE)
+    data = grove.Collection({'items': '~/items.csv'})
+    assert read_before_overwrite(data.items)
+
+    # URLs are only fetched on access
+    data['remote'] = 'https://example.com/data/items.csv'
+    assert data.dataframe_list == ['items', 'remote']
+
+
+def test_read_columnar_formats(tmp_path):
+    pytest.importorskip('pyarrow')
+    df = pd.DataFrame({'id': ['A1', 'A2', 'B1'], 'value': [1, 2, 3]})
+    df.to_parquet(tmp_path / 'data.parquet')
+    df.to_feather(tmp_path / 'data.feather')
+
+    data = grove.Collection({
+        'parquet': tmp_path / 'data.parquet',
+        'feather': tmp_path / 'data.feather'
+    })
+    assert data.parquet.compare(df).empty
+    assert data.feather.compare(df).empty
+
+
+def test_create_collection_from_generator():
+    data = grove.Collection(
+        (name, f'test/data/{name}.csv') for name in ['items', 'categories']
+    )
+    assert data.dataframe_list == ['categories', 'items']
+
+    with pytest.raises(grove.GroveError):
+        grove.Collection(42)
+
+
+def test_copy_and_pickle_collection():
+    data = grove.Collection([('items', 'test/data/items.csv')])
+    data_copy = copy.copy(data)
+    data_unpickled = pickle.loads(pickle.dumps(data))
+    assert data_copy.items.shape == (6, 2)
+    assert data_unpickled.items.compare(data.items).empty
+    with pytest.raises(AttributeError):
+        _ = data.not_there
+
+
+def test_string_backend():
+    pytest.importorskip('pyarrow')
+    data = grove.Collection([('measurements', 'test/data/measurements.csv')],
+                            string_backend='pyarrow')
+    assert isinstance(data.measurements['id'].dtype, pd.StringDtype)
+    assert data.measurements['id'].dtype.storage == 'pyarrow'
+    assert data.measurements['value'].dtype == 'int64'
+
+    with pytest.raises(grove.GroveError):
+        grove.Collection([('measurements', 'test/data/measurements.csv')],
+                         string_backend='arrow')
+
+
+def test_max_resident(tmp_path):
+    paths = write_csv_files(tmp_path, ['items', 'categories', 'measurements'])
+    data = grove.Collection(paths, max_resident=2)
+    items = data.items
+    _ = data['categories']
+    assert data.items is items
+    _ = data.measurements
+    overwrite_csv_files(paths)
+    assert read_before_overwrite(data.measurements)
+
+    # The least recently used DataFrames were unloaded and are read again
+    assert not read_before_overwrite(data.categories)
+    assert not read_before_overwrite(data.items)
+
+    for max_resident in (0, -1, 1.5):
+        with pytest.raises(grove.GroveError):
+            grove.Collection(paths, max_resident=max_resident)
+
+    # In-place changes would be lost when unloading
+    with pytest.raises(grove.GroveError):
+        data.reduce_mem()
+    with pytest.raises(grove.GroveError):
+        data.share_categories('id')
+    with pytest.raises(grove.GroveError):
+        data.set_join_key('id')
+
+
+def test_collection_info_deep():
+    df = pd.DataFrame({'id': pd.Series(['a' * 100, 'b' * 100], dtype=object)})
+    data = grove.Collection({'A': df})
+
+    assert info_mib(data, deep=True)['A'] > info_mib(data)['A']
+
+
+def test_share_categories():
+    data = grove.Collection(
+        [('items', 'test/data/items.csv'),
+         ('categories', 'test/data/categories.csv'),
+         ('measurements', 'test/data/measurements.csv')
+         ]
+    )
+    merged_df = data.merge(['items', 'categories', 'measurements'], on='id')
+
+    data.share_categories(['id', 'category'])
+    assert isinstance(data['items']['id'].dtype, pd.CategoricalDtype)
+    assert data['items']['id'].dtype == data['measurements']['id'].dtype
+    assert isinstance(data['categories']['category'].dtype, pd.CategoricalDtype)
+
+    merged_df_shared = data.merge(['items', 'categories', 'measurements'], on='id')
+    assert merged_df_shared.astype(merged_df.dtypes.to_dict()).equals(merged_df)
+
+
+def test_set_join_key():
+    data = grove.Collection(
+        [('items', 'test/data/items.csv'),
+         ('categories', 'test/data/categories.csv'),
+         ('measurements', 'test/data/measurements.csv')
+         ]
+    )
+    data['items'] = data['items'].iloc[::-1]
+    merged_df = data.merge(['items', 'categories', 'measurements'], on='id')
+
+    data.set_join_key('id')
+    assert data['items']['id'].is_monotonic_increasing
+    assert data['items'].index.to_list() == [0, 1, 2, 3, 4, 5]
+    merged_df_sorted = data.merge(['items', 'categories', 'measurements'], on='id')
+    sort_columns = merged_df.columns.to_list()
+    assert merged_df_sorted.sort_values(sort_columns, ignore_index=True).equals(
+        merged_df.sort_values(sort_columns, ignore_index=True)
+    )
@@ -26,9 +26,10 @@ def test_merge_same_id():
         data['measurements'], on='id'
     )
 
-    assert merged_df.compare(merged_df_pandas).empty
-    assert data['items'].compare(merged_single).empty
-    assert merged_df.compare(merged_df_implicit).empty
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas, check_dtype=False)
+    assert merged_single.equals(data['items'])
+    assert merged_single is not data['items']
+    assert merged_df.equals(merged_df_implicit)
 
 
 def test_merge_diff_id():
@@ -51,10 +52,13 @@ def test_merge_diff_id():
         data['measurements'], left_on=id_list[1][0], right_on=id_list[1][1]
     )
 
-    assert merged_df.compare(merged_df_pandas).empty
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas, check_dtype=False)
     with pytest.raises(grove.GroveError,
                        match="'id_x' not present in DataFrame 1"):
         data.merge(['items', 'categories'], on=[['id', 'id_x']])
+    with pytest.raises(grove.GroveError,
+                       match="'id_x' not present in DataFrame 1; 'id_y' not present in DataFrame 2"):
+        data.merge(['items', 'categories', 'measurements'], on=[['id', 'id_x'], ['id1', 'id_y']])
 
 
 def test_merge_mixed_id():
@@ -72,7 +76,7 @@ def test_merge_mixed_id():
         ),
         data['cat_descr'], left_on=id_list[1][0], right_on=id_list[1][1]
     )
-    assert merged_df.compare(merged_df_pandas).empty
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas, check_dtype=False)
 
 
 def test_merge_multicolumn():
@@ -103,8 +107,8 @@ def test_merge_multicolumn():
     merged_df_common = data.merge(['items', 'categories', 'measurements'],
                                   on=id_list_common)
 
-    assert merged_df.compare(merged_df_pandas).empty
-    assert merged_df_common.compare(merged_df).empty
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas, check_dtype=False)
+    pd.testing.assert_frame_equal(merged_df_common, merged_df, check_dtype=False)
 
 
 def test_merge_dataframes():
@@ -125,19 +129,22 @@ def test_merge_dataframes():
         ),
         df_list[2], left_on=id_list[1][0], right_on=id_list[1][1]
     )
-    assert merged_df.compare(merged_df_pandas).empty
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas, check_dtype=False)
 
 
-def test_reduce_mem_series():
+@pytest.fixture(scope='module')
+def rand_df():
     rng = np.random.default_rng(42)
     df_len = 10
-    df = pd.DataFrame.from_records(
-        zip(rng.integers(0, int(1e6), size=df_len),
-            rng.random(size=df_len) * 1e6,
-            rng.integers(0, 1, size=df_len)
-            ),
-        columns=['integers', 'floats', 'binaries']
-    )
+    return pd.DataFrame({
+        'integers': rng.integers(0, int(1e6), size=df_len),
+        'floats': rng.random(size=df_len) * 1e6,
+        'binaries': rng.integers(0, 1, size=df_len)
+    })
+
+
+def test_reduce_mem_series(rand_df):
+    df = rand_df
 
     assert grove.reduce_mem_series(df['integers']).dtype <= 'uint64'
     assert grove.reduce_mem_series(df['integers']).dtype == 'uint32'
@@ -147,16 +154,8 @@ def test_reduce_mem_series():
                                    target_float='float32').dtype == 'float32'
 
 
-def test_reduce_mem_df():
-    rng = np.random.default_rng(42)
-    df_len = 10
-    df = pd.DataFrame.from_records(
-        zip(rng.integers(0, int(1e6), size=df_len),
-            rng.random(size=df_len) * 1e6,
-            rng.integers(0, 1, size=df_len)
-            ),
-        columns=['integers', 'floats', 'binaries']
-    )
+def test_reduce_mem_df(rand_df):
+    df = rand_df.copy()  # Changed in-place below
 
     opt_df = grove.reduce_mem_df(df)
     assert opt_df['integers'].dtype == 'uint32'
@@ -170,26 +169,202 @@ def test_reduce_mem_df():
 
 
 def test_sanity_check_df():
-    df_fail = pd.DataFrame.from_records(
-        zip(np.array([10, 20, 30, 10, 40], dtype='uint8'),
-            np.array([1, 2, 3, 4, 5], dtype='uint8'),
-            ['a', 'b', 'c', 'd', 'e'],
-            ['10', '20', '30', '40', None],
-            [np.nan] * 5
-            ),
-        columns=['id', 'idx', 'descr', 'serials', 'extra']
-    )
-    df_ok = pd.DataFrame.from_records(
-        zip(np.array([10, 20, 30, 10, 40], dtype='uint8'),
-            np.array([1, 2, 3, 4, 5], dtype='uint8')
-            ),
-        columns=['id', 'idx']
-    )
+    df_fail = pd.DataFrame({
+        'id': np.array([10, 20, 30, 10, 40], dtype='uint8'),
+        'idx': np.array([1, 2, 3, 4, 5], dtype='uint8'),
+        'descr': ['a', 'b', 'c', 'd', 'e'],
+        'serials': ['10', '20', '30', '40', None],
+        'extra': [np.nan] * 5
+    })
+    df_ok = pd.DataFrame({
+        'id': np.array([10, 20, 30, 10, 40], dtype='uint8'),
+        'idx': np.array([1, 2, 3, 4, 5], dtype='uint8')
+    })
     assert not grove.sanity_check_df(df_fail)
     assert grove.sanity_check_df(df_ok)
+    assert not grove.sanity_check_df(df_fail, fail_fast=True)
+    assert not grove.sanity_check_df(df_ok, id_column='id', fail_fast=True)
+    assert grove.sanity_check_df(df_ok, id_column='idx', fail_fast=True)
 
 
 def test_depth():
     assert grove._depth('A') == 0
     assert grove._depth(['A', 'B']) == 1
     assert grove._depth([['A_left', 'B_left'], ['A_right', 'B_right']]) == 2
+
+
+def test_merge_key_dtypes():
+    df1 = pd.DataFrame({'id': np.array([1, 2, 3], dtype='int32'),
+                        'a': ['x', 'y', 'z']})
+    df2 = pd.DataFrame({'id': np.array([2, 3, 4], dtype='int64'),
+                        'b': [20, 30, 40]})
+    df3 = pd.DataFrame({'id': np.array([2, 3, 4], dtype='float64'),
+                        'c': [20, 30, 40]})
+    data = grove.Collection({'A': df1, 'B': df2, 'C': df3})
+    with pytest.raises(grove.GroveError):
+        data.merge(['A', 'B'], on=[[['id', 'a'], ['id', 'a']]])
+
+    # Same result as pd.merge, through both merge functions, and the key dtypes are left as is
+    for names in (['A', 'B'], ['B', 'A'], ['A', 'C']):
+        expected_result = pd.merge(data[names[0]], data[names[1]], on='id')
+        pd.testing.assert_frame_equal(data.merge(names, on='id'), expected_result)
+        pd.testing.assert_frame_equal(grove.merge(data[names], on='id'), expected_result)
+    assert data['A']['id'].dtype == 'int32'
+    assert data['B']['id'].dtype == 'int64'
+
+    df1 = pd.DataFrame({'id': np.array([2**53, 2**53 + 1], dtype='int64'),
+                        'a': ['x', 'y']})
+    df2 = pd.DataFrame({'id': np.array([2**53 + 1, 2**53 + 3], dtype='uint64'),
+                        'b': [10, 30]})
+    data = grove.Collection({'A': df1, 'B': df2})
+    pd.testing.assert_frame_equal(data.merge(['A', 'B'], on='id'), pd.merge(df1, df2, on='id'))
+    assert data['A']['id'].tolist() == [2**53, 2**53 + 1]
+
+
+def test_merge_empty():
+    data = grove.Collection(
+        [('items', 'test/data/items.csv'),
+         ('categories', 'test/data/categories.csv'),
+         ('measurements', 'test/data/measurements.csv')
+         ]
+    )
+    data['no_items'] = data['items'].iloc[:0]
+    merged_df = data.merge(['no_items', 'categories', 'measurements'], on='id')
+    expected_columns = data.merge(['items', 'categories', 'measurements'], on='id').columns
+
+    assert merged_df.shape[0] == 0
+    assert merged_df.columns.to_list() == expected_columns.to_list()
+
+    # Empty intermediate result
+    data['other_items'] = data['items'].assign(id='X')
+    merged_df = data.merge(['other_items', 'categories', 'measurements'], on='id')
+    assert merged_df.shape[0] == 0
+    assert merged_df.columns.to_list() == expected_columns.to_list()
+
+
+def test_merge_sorted_key():
+    df1 = pd.DataFrame({'value': [1, 2, 3, 4], 'id': [10, 20, 30, 40]})
+    df2 = pd.DataFrame({'id': [20, 30, 40, 50], 'value': [5, 6, 7, 8]})
+    df3 = pd.DataFrame({'id': [10, 30, 40], 'value': [9, 10, 11], 'extra': ['a', 'b', 'c']})
+
+    merged_df = grove.merge([df1, df2, df3], on='id')
+    merged_df_pandas = pd.merge(
+        pd.merge(df1, df2, on='id', suffixes=('_0', '_1')),
+        df3, on='id', suffixes=('_1', '_2')
+    )
+    assert merged_df.columns.to_list() == ['value_0', 'id', 'value_1', 'value', 'extra']
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas)
+
+    # Repeated keys
+    df4 = pd.DataFrame({'id': [10, 10, 30, 30, 30, 50], 'other': [1, 2, 3, 4, 5, 6]})
+    merged_df = grove.merge([df1, df3, df4], on='id')
+    merged_df_pandas = pd.merge(
+        pd.merge(df1, df3, on='id', suffixes=('_0', '_1')),
+        df4, on='id', suffixes=('_1', '_2')
+    )
+    assert merged_df.shape[0] == 5
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas)
+
+    # Reduced key dtypes are kept
+    df1, df3, df4 = [df.astype({'id': 'int32'}) for df in (df1, df3, df4)]
+    merged_df = grove.merge([df1, df3, df4], on='id')
+    assert merged_df['id'].dtype == 'int32'
+
+
+def test_merge_string_keys_dtype():
+    data = grove.Collection(
+        [('items', 'test/data/items.csv'),
+         ('categories', 'test/data/categories.csv'),
+         ('cat_descr', 'test/data/category_descriptions.csv')
+         ]
+    )
+    merged_df = data.merge(['items', 'categories', 'cat_descr'],
+                           on=['id', ['category', 'category_code']])
+    merged_df_pandas = pd.merge(
+        pd.merge(data['items'], data['categories'], on='id'),
+        data['cat_descr'], left_on='category', right_on='category_code'
+    )
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas)
+    assert merged_df['id'].dtype == data['items']['id'].dtype
+    assert merged_df['category'].dtype == data['categories']['category'].dtype
+    assert merged_df['category_code'].dtype == data['cat_descr']['category_code'].dtype
+    assert data['items']['id'].dtype != 'category'
+
+
+def test_merge_selected_columns():
+    data = grove.Collection(
+        [('items', 'test/data/items.csv'),
+         ('categories', 'test/data/categories.csv'),
+         ('measurements', 'test/data/measurements.csv')
+         ]
+    )
+    merged_df = data.merge(['items', 'categories', 'measurements'], on='id',
+                           columns={'items': [], 'measurements': ['value']})
+    merged_df_pandas = pd.merge(
+        pd.merge(
+            data['items'][['id']], data['categories'], on='id'
+        ),
+        data['measurements'][['id', 'value']], on='id'
+    )
+    assert merged_df.columns.to_list() == ['id', 'category', 'value']
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas, check_dtype=False)
+    assert data['measurements'].shape == (15, 3)
+
+    with pytest.raises(grove.GroveError):
+        data.merge(['items', 'categories'], columns={'items': []})
+    with pytest.raises(grove.GroveError, match=r"'valeu' not present in DataFrame 2"):
+        data.merge(['items', 'categories', 'measurements'], on='id',
+                   columns={'measurements': ['valeu']})
+
+
+def test_merge_aligned_key(monkeypatch):
+    ids = ['A1', 'A2', 'B1']
+    df1 = pd.DataFrame({'id': ids, 'value': [1, 2, 3]}, index=[5, 6, 7])
+    df2 = pd.DataFrame({'value': [4, 5, 6], 'id': ids})
+    df3 = pd.DataFrame({'id': ids, 'value': [7, 8, 9], 'extra': [0.1, 0.2, 0.3]})
+
+    merged_df = grove.merge([df1, df2, df3], on='id')
+    merged_df_pandas = pd.merge(
+        pd.merge(df1, df2, on='id', suffixes=('_0', '_1')),
+        df3, on='id', suffixes=('_1', '_2')
+    )
+    assert merged_df.columns.to_list() == ['id', 'value_0', 'value_1', 'value', 'extra']
+    assert merged_df.index.to_list() == [0, 1, 2]
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas)
+
+    # The rows are put side by side: pd.merge is only used for the result layout
+    pd_merge = pd.merge
+
+    def merge_empty(left, right, **kwargs):
+        assert left.shape[0] == 0 and right.shape[0] == 0
+        return pd_merge(left, right, **kwargs)
+
+    monkeypatch.setattr(pd, 'merge', merge_empty)
+    pd.testing.assert_frame_equal(grove.merge([df1, df2, df3], on='id'), merged_df_pandas)
+
+
+def test_merge_unique_right_key():
+    df1 = pd.DataFrame({'id': ['B', 'A', 'C', 'B', 'D'], 'value': [1, 2, 3, 4, 5]},
+                       index=[10, 11, 12, 13, 14])
+    df2 = pd.DataFrame({'value': [0.1, 0.2, 0.3], 'id': ['A', 'B', 'E']})
+
+    merged_df = grove.merge([df1, df2], on='id')
+    merged_df_pandas = pd.merge(df1, df2, on='id', suffixes=('_0', '_1'))
+    assert merged_df.columns.to_list() == ['id', 'value_0', 'value_1']
+    assert merged_df['id'].to_list() == ['B', 'A', 'B']
+    pd.testing.assert_frame_equal(merged_df, merged_df_pandas, check_dtype=False)
+
+
+def test_merge_reorder():
+    rng = np.random.default_rng(0)
+    df1 = pd.DataFrame({'id': rng.integers(0, 50, 1000), 'value': rng.random(1000)})
+    df2 = pd.DataFrame({'id': rng.integers(0, 50, 1000), 'value': rng.random(1000)})
+    df3 = pd.DataFrame({'id': [3, 7, 7, 60], 'label': ['a', 'b', 'c', 'd']})
+
+    merged_df = grove.merge([df1, df2, df3], on='id')
+    merged_df_reordered = grove.merge([df1, df2, df3], on='id', reorder=True)
+    assert merged_df_reordered.columns.to_list() == ['id', 'value_0', 'value_1', 'label']
+    sort_columns = merged_df.columns.to_list()
+    assert merged_df_reordered.sort_values(sort_columns, ignore_index=True).equals(
+        merged_df.sort_values(sort_columns, ignore_index=True)
+    )